@@ -1,7 +1,13 @@
+import orjson
+import random
 import requests
 import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, Any, Union
+from requests.adapters import HTTPAdapter
 from requests.exceptions import HTTPError
+from urllib3.util.retry import Retry
 from models import ScopusSearchEquation
 import logging
 import os
@@ -13,6 +19,30 @@ class ScopusAPI:
     _instance = None
     _lock = threading.Lock()
     BASE_URL = "https://api.elsevier.com/content/search/scopus"
+    # Every STANDARD view field (carried by the CSV/JSON export) plus the COMPLETE view fields the parsers read,
+    # requested by default so the rest of the COMPLETE view stays out of the payload
+    DEFAULT_FIELDS = ",".join([
+        # Identifiers and links
+        "dc:identifier", "eid", "pii", "pubmed-id", "orcid", "prism:doi", "prism:url", "link",
+        # Document and source
+        "dc:title", "prism:aggregationType", "subtype", "subtypeDescription", "prism:publicationName",
+        "prism:isbn", "prism:issn", "prism:eIssn", "source-id", "prism:volume", "prism:issueIdentifier",
+        "prism:pageRange", "article-number", "prism:coverDate", "prism:coverDisplayDate",
+        # Access and citations
+        "openaccess", "openaccessFlag", "freetoread", "freetoreadLabel", "citedby-count",
+        # Authors and affiliations
+        "dc:creator", "authname", "affilname", "affiliation-city", "affiliation-country",
+        # Read by parse_results and the animations
+        "dc:description", "authkeywords",
+    ])
+    # (connect, read) timeouts in seconds, so a stalled socket cannot hang the app
+    TIMEOUT = (5.0, 10.0)
+    RETRY_STATUS_CODES = frozenset({429, 500, 502, 503, 504})
+    # Only idempotent verbs may be replayed after a failure
+    IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+    # Requests in flight across every search_all call (and every app session) sharing this singleton
+    MAX_CONCURRENT_REQUESTS = 8
+    _request_slots = threading.BoundedSemaphore(MAX_CONCURRENT_REQUESTS)
     
     def __new__(cls, api_key: str, *args, **kwargs) -> "ScopusAPI":
         with cls._lock:
@@ -20,12 +50,24 @@ class ScopusAPI:
                 cls._instance = super().__new__(cls)
                 cls._instance.api_key = api_key
                 
+                # Share one pooled session so consecutive batches reuse the same TCP/TLS connection
+                session = requests.Session()
+                session.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=cls.MAX_CONCURRENT_REQUESTS, max_retries=Retry(total=0)))
+                session.headers.update({
+                    "Accept": "application/json",
+                    "X-ELS-APIKey": api_key
+                })
+                cls._instance.session = session
+                
                 # Initialize logger configuration when creating the singleton
                 log_file = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'scopus_api.log')
                 
-                # Configure logger
+                # Configure logger, quiet (WARNING) unless SCOPUS_API_LOG_LEVEL asks for more detail
                 cls._instance.logger = logging.getLogger('ScopusAPI')
-                cls._instance.logger.setLevel(logging.DEBUG)
+                log_level = os.getenv("SCOPUS_API_LOG_LEVEL", "WARNING").upper()
+                # getLevelName maps a known level name to its number, anything else comes back as a "Level ..." string
+                invalid_log_level = not isinstance(logging.getLevelName(log_level), int)
+                cls._instance.logger.setLevel(logging.WARNING if invalid_log_level else log_level)
                 
                 # Only add handlers if none exist
                 if not cls._instance.logger.handlers:
@@ -42,89 +84,160 @@ class ScopusAPI:
                     cls._instance.logger.addHandler(file_handler)
                     cls._instance.logger.addHandler(console_handler)
                 
+                if invalid_log_level:
+                    cls._instance.logger.warning(f"Unknown SCOPUS_API_LOG_LEVEL {log_level!r}, using WARNING")
+                
             return cls._instance
 
+    def _request_with_retry(self, params: Dict[str, Any], method: str = "GET", max_retries: int = 3, base: float = 1.0, cap: float = 30.0) -> requests.Response:
+        """
+        Issue a request to the Scopus API, retrying throttled (429), server-side (5xx) and connection failures
+        with capped exponential backoff and jitter. A Retry-After header from the server is honored up to cap, longer waits fail at once.
+        """
+        if method.upper() not in self.IDEMPOTENT_METHODS:
+            max_retries = 0
+        
+        for attempt in range(max_retries + 1):
+            is_last_attempt = attempt == max_retries
+            try:
+                # Hold a slot only for the request itself, backoff sleeps do not count against the limit
+                with self._request_slots:
+                    response = self.session.request(method, self.BASE_URL, params=params, timeout=self.TIMEOUT)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                if is_last_attempt:
+                    self.logger.error(f"Request failed after {attempt + 1} attempts: {e}")
+                    raise
+                response = None
+                
+            if response is not None and response.status_code not in self.RETRY_STATUS_CODES:
+                return response
+            
+            if is_last_attempt:
+                if response.status_code == 429:
+                    self.logger.error("Rate limit exceeded")
+                    raise HTTPError("Rate limit exceeded. Please try again later.", response=response)
+                self.logger.error(f"Error {response.status_code} after {attempt + 1} attempts: {response.text}")
+                raise HTTPError(f"Error {response.status_code}: {response.text}", response=response)
+            
+            # Full backoff window grows as base * 2^attempt, jitter spreads retries of concurrent batches apart
+            delay = min(cap, base * 2 ** attempt) * (0.5 + random.random() * 0.5)
+            if response is not None and 'Retry-After' in response.headers:
+                try:
+                    retry_after = float(response.headers['Retry-After'])
+                except ValueError:
+                    retry_after = None  # Retry-After given as an HTTP date, keep the computed delay
+                if retry_after is not None:
+                    # A wait past the cap (e.g. an exhausted quota) would block the page behind the spinner, fail fast instead
+                    if retry_after > cap:
+                        self.logger.error(f"Status {response.status_code} with Retry-After {retry_after:.0f}s, above the {cap:.0f}s cap")
+                        raise HTTPError(f"Rate limit exceeded, Scopus asks to retry in {retry_after:.0f}s. Please try again later.", response=response)
+                    delay = max(delay, retry_after)
+            
+            reason = f"status {response.status_code}" if response is not None else "connection error"
+            self.logger.warning(f"Request failed with {reason}, retrying in {delay:.1f}s (attempt {attempt + 1}/{max_retries})")
+            time.sleep(delay)
+
     def search(self, search_equation: Union[str, ScopusSearchEquation], count: int = 25, start: int = 0, view: str = "STANDARD", **kwargs) -> Dict[str, Any]:
         """
         Perform a search using a validated ScopusSearchEquation.
+        Only DEFAULT_FIELDS are requested unless a field list is passed, field=None returns the full view.
         """
         if not isinstance(search_equation, ScopusSearchEquation):
             search_equation = ScopusSearchEquation(search_equation)
         
-        headers = {
-            "Accept": "application/json",
-            "X-ELS-APIKey": self.api_key
-        }
+        return self._fetch_page(str(search_equation), count=count, start=start, view=view, **kwargs)
+
+    def _fetch_page(self, query: str, count: int = 25, start: int = 0, view: str = "STANDARD", **kwargs) -> Dict[str, Any]:
+        """
+        Fetch a single page of results for an already validated query string.
+        """
         params = {
-            "query": str(search_equation),
+            "query": query,
             "count": count,
             "start": start,
-            "view": view
+            "view": view,
+            "field": self.DEFAULT_FIELDS
         }
         params.update(kwargs)
         
-        self.logger.info(f"Making request to Scopus API with params: {params}")
-        response = requests.get(self.BASE_URL, headers=headers, params=params)
-        
-        self.logger.debug(f"Request URL: {response.url}")
-        self.logger.debug(f"Response Status Code: {response.status_code}")
+        response = self._request_with_retry(params)
         
-        # Log response details before parsing
-        if response.status_code == 200:
-            response_json = response.json()
-            total_results = response_json.get('search-results', {}).get('opensearch:totalResults')
-            entries_count = len(response_json.get('search-results', {}).get('entry', []))
-            self.logger.info(f"Total results reported by Scopus: {total_results}")
-            self.logger.info(f"Number of entries in current response: {entries_count}")
+        if self.logger.isEnabledFor(logging.DEBUG):
+            self.logger.debug(f"Request URL: {response.url} - Status: {response.status_code} - Bytes: {len(response.content)}")
         
         response.raise_for_status()
         if response.status_code == 204:
             self.logger.warning("No content found for the given search equation.")
             raise HTTPError("No content found for the given search equation.")
-        if response.status_code == 429:
-            self.logger.error("Rate limit exceeded")
-            raise HTTPError("Rate limit exceeded. Please try again later.")
         if response.status_code != 200:
             self.logger.error(f"Error {response.status_code}: {response.text}")
             raise HTTPError(f"Error {response.status_code}: {response.text}")
+        
+        # Decode the payload once and reuse it for logging and the return value
+        data = orjson.loads(response.content)
+        if self.logger.isEnabledFor(logging.INFO):
+            total_results = data.get('search-results', {}).get('opensearch:totalResults')
+            entries_count = len(data.get('search-results', {}).get('entry', []))
+            self.logger.info(f"Fetched {entries_count} entries (start={start}, count={count}, view={view}, total reported by Scopus: {total_results}) for query: {query}")
             
-        return response.json()
+        return data
 
-    def search_all(self, search_equation: Union[str, ScopusSearchEquation], total_count: int = 100, view: str = "STANDARD", **kwargs) -> dict:
+    def search_all(self, search_equation: Union[str, ScopusSearchEquation], total_count: int = 100, view: str = "STANDARD", max_workers: int = 4, **kwargs) -> dict:
         """
         Fetches up to total_count results by batching requests (25 per request) and combines them into a single JSON-like dict.
+        The first batch reports how many results exist, the remaining batches are then requested concurrently
+        (up to max_workers at a time) over the shared session.
         """
         self.logger.info(f"Starting batch search for {total_count} results")
-        all_entries = []
         batch_size = 25
-        total_retrieved = 0
         
-        for start in range(0, total_count, batch_size):
-            self.logger.debug(f"Fetching batch starting at index {start}")
-            batch = self.search(search_equation, count=min(batch_size, total_count - start), start=start, view=view, **kwargs)
-            entries = batch.get('search-results', {}).get('entry', [])
-            
-            batch_count = len(entries)
-            total_retrieved += batch_count
-            self.logger.info(f"Retrieved {batch_count} entries in current batch. Total retrieved so far: {total_retrieved}")
-            
-            all_entries.extend(entries)
-            
-            # Get the total available results from the first batch
-            if start == 0:
-                total_available = int(batch.get('search-results', {}).get('opensearch:totalResults', 0))
-                self.logger.info(f"Total results available according to Scopus: {total_available}")
-                if total_available < total_count:
-                    self.logger.warning(f"Requested {total_count} results but only {total_available} are available")
+        # Validate and stringify the equation once instead of once per page
+        if not isinstance(search_equation, ScopusSearchEquation):
+            search_equation = ScopusSearchEquation(search_equation)
+        query = str(search_equation)
+        
+        # Get the total available results from the first batch
+        first_batch = self._fetch_page(query, count=min(batch_size, total_count), start=0, view=view, **kwargs)
+        all_entries = list(first_batch.get('search-results', {}).get('entry', []))
+        total_available = int(first_batch.get('search-results', {}).get('opensearch:totalResults', 0))
+        self.logger.info(f"Total results available according to Scopus: {total_available}")
+        if total_available < total_count:
+            self.logger.warning(f"Requested {total_count} results but only {total_available} are available")
+            total_count = total_available
+        # A short first batch means there is nothing left to fetch
+        if len(all_entries) < batch_size:
+            total_count = len(all_entries)
+        
+        # Only the pages Scopus can fill are requested, their offsets are known up front so all can be in flight at once
+        pages = [(start, min(batch_size, total_count - start)) for start in range(batch_size, total_count, batch_size)]
+        
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            futures = [
+                pool.submit(self._fetch_page, query, count=count, start=start, view=view, **kwargs)
+                for start, count in pages
+            ]
             
-            # Stop if less than batch_size returned (end of results)
-            if batch_count < min(batch_size, total_count - start):
-                self.logger.info(f"Reached end of results after retrieving {total_retrieved} entries")
-                break
+            try:
+                # Consume pages in order while later ones are still downloading
+                for index, ((start, count), future) in enumerate(zip(pages, futures)):
+                    batch = future.result()
+                    entries = batch.get('search-results', {}).get('entry', [])
+                    all_entries.extend(entries)
+
+                    # Stop if less than count returned (end of results), and drop requests for the pages past it
+                    if len(entries) < count:
+                        self.logger.info(f"Reached end of results after retrieving {len(all_entries)} entries")
+                        for pending in futures[index + 1:]:
+                            pending.cancel()
+                        break
+            except BaseException:
+                # A failed page fails the search, drop the queued pages instead of downloading (and retrying) them first
+                pool.shutdown(wait=False, cancel_futures=True)
+                raise
         
         # Use the first batch as the base result and update entries
-        if 'search-results' in batch:
+        if 'search-results' in first_batch:
             self.logger.info(f"Final count of entries retrieved: {len(all_entries)}")
-            batch['search-results']['entry'] = all_entries
+            first_batch['search-results']['entry'] = all_entries
             
-        return batch
+        return first_batch
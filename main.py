@@ -3,72 +3,100 @@ import controllers
 import models
 import os
 import dotenv
+import io
 import pandas as pd
-import matplotlib.pyplot as plt
-from wordcloud import WordCloud
-import plotly.express as px
+import numpy as np
 from datetime import datetime
-from utils import limit_dataframe_for_graph, parse_results, filter_by_period
-from utils.animations import (parse_results_for_animation, prepare_rolling_data, 
-                           generate_animated_country_map, generate_animated_author_chart,
-                           generate_animated_word_cloud_gif, calculate_max_window)
-import json # Added import
+from utils import limit_dataframe_for_graph, parse_results, filter_by_period, entry_years, entries_cache_key, flatten_entries, compact_entries
+import orjson
+# wordcloud, plotly and utils.animations are imported where they are used, keeping the first page load light
 
 # --- Caching Helper Functions ---
-@st.cache_data
-def generate_wordcloud_figure(words_list): # Renamed parameter
-    """Generates a WordCloud figure from a list of words.""" # Updated docstring
-    if not words_list:
-        return None
-    # Join the list of words into a single string for the word cloud
-    text = ' '.join(words_list)
-    wc = WordCloud(width=800, height=400, background_color='white').generate(text)
-    fig, ax = plt.subplots(figsize=(10, 5))
-    ax.imshow(wc, interpolation='bilinear')
-    ax.axis('off')
-    return fig
+@st.cache_data(ttl=3600, show_spinner=False)
+def cached_search(equation_str, limit, api_key):
+    """Runs a Scopus batch search, reusing the result for repeated (equation, limit) queries."""
+    result = controllers.ScopusAPI(api_key).search_all(equation_str, total_count=limit)
+    # Repeated values (document types, sources, names, countries) are stored once, pickling keeps the sharing
+    compact_entries(result.get('search-results', {}).get('entry', []))
+    return result
 
-@st.cache_data
-def generate_bar_chart(data_list, column_name, title):
-    """Generates a Plotly bar chart for top 25 items."""
-    if not data_list:
+@st.cache_data(show_spinner=False, max_entries=32)
+def count_words(entries_key, _words_list, top_n=200):
+    """Counts the (already normalized) words for the word cloud, once per entries_key."""
+    counts = _words_list.value_counts(sort=False).sort_values(ascending=False, kind='stable').head(top_n)
+    # Sorted by word so the image cache key depends only on the frequencies, not on the order words were seen in
+    return tuple(sorted(zip(counts.index, counts.tolist())))
+
+@st.cache_data(show_spinner=False)
+def generate_wordcloud_image(word_freqs):
+    """Generates a PNG word cloud image from (word, count) pairs."""
+    if not word_freqs:
         return None
-    df = pd.DataFrame({column_name: data_list})
-    count_df = df[column_name].value_counts().reset_index()
-    count_df.columns = [column_name, 'Count']
+    from wordcloud import WordCloud
+    wc = WordCloud(width=800, height=400, background_color='white').generate_from_frequencies(dict(word_freqs))
+    buffer = io.BytesIO()
+    wc.to_image().save(buffer, format='PNG')
+    return buffer.getvalue()
+
+@st.cache_data(show_spinner=False, max_entries=8)
+def entries_to_csv(entries_key, _entries):
+    """Serializes entries to CSV bytes, once per entries_key."""
+    # Nested authors/affiliations are flattened to '; '-joined name columns
+    buffer = io.BytesIO()
+    flatten_entries(_entries).to_csv(buffer, index=False, lineterminator='\n', encoding='utf-8')
+    return buffer.getvalue()
+
+@st.cache_data(show_spinner=False, max_entries=8)
+def entries_to_json(entries_key, _entries):
+    """Serializes entries to indented JSON bytes, once per entries_key."""
+    return orjson.dumps(_entries, option=orjson.OPT_INDENT_2)
+
+@st.cache_data(show_spinner=False, max_entries=128)
+def aggregate_counts(entries_key, _items, column_name):
+    """Counts occurrences of each item into a [column_name, 'Count'] frame, most frequent first, once per (entries_key, column_name)."""
+    if isinstance(_items.dtype, pd.CategoricalDtype):
+        # Categories are built from the observed values in order of first appearance, so counting is a bincount over the codes
+        labels = _items.cat.categories.to_numpy()
+        counts = np.bincount(_items.cat.codes, minlength=len(labels))
+        order = np.argsort(-counts, kind='stable')
+        order = order[counts[order] > 0]
+    else:
+        labels, first_seen, counts = np.unique(_items.to_numpy(), return_index=True, return_counts=True)
+        order = np.lexsort((first_seen, -counts))
+    # Most frequent first, ties in order of first appearance
+    return pd.DataFrame({column_name: labels[order], 'Count': counts[order]})
+
+# Figures are cached as shared objects, st.cache_data would unpickle a fresh copy of each one on every rerun.
+# They are only read by st.plotly_chart, never modified after they are returned.
+@st.cache_resource(max_entries=64)
+def generate_bar_chart(count_df, column_name, title):
+    """Generates a Plotly bar chart for the top 25 items of an aggregated count frame."""
     count_df = limit_dataframe_for_graph(count_df, 'Count', column_name)
     if count_df.empty:
         return None
+    import plotly.express as px
     fig = px.bar(count_df, x=column_name, y='Count', title=title)
     return fig
 
-@st.cache_data
-def generate_line_chart(years_list, title):
-    """Generates a Plotly line chart for publications by year."""
-    if not years_list:
-        return None
-    year_df = pd.DataFrame({'Year': years_list})
-    year_count = year_df['Year'].value_counts().sort_index().reset_index()
-    year_count.columns = ['Year', 'Count']
-    if year_count.empty:
+@st.cache_resource(max_entries=64)
+def generate_line_chart(year_counts, title):
+    """Generates a Plotly line chart for publications by year from aggregated year counts."""
+    if year_counts.empty:
         return None
-    fig = px.line(year_count, x='Year', y='Count', markers=True, title=title)
+    import plotly.express as px
+    fig = px.line(year_counts.sort_values('Year'), x='Year', y='Count', markers=True, title=title)
     return fig
 
-@st.cache_data
-def generate_country_map(countries_list, title):
-    """Generates a Plotly choropleth map for publications by country."""
-    if not countries_list:
-        return None
-    country_df = pd.DataFrame({'Country': countries_list})
-    country_count = country_df['Country'].value_counts().reset_index()
-    country_count.columns = ['Country', 'Count']
-    if country_count.empty:
+@st.cache_resource(max_entries=64)
+def generate_country_map(country_counts, title):
+    """Generates a Plotly choropleth map for publications by country from aggregated country counts."""
+    if country_counts.empty:
         return None
     
+    import plotly.express as px
     # Attempt to create the choropleth map
     try:
-        fig = px.choropleth(country_count, 
+        fig = px.choropleth(country_counts, 
                             locations="Country", 
                             locationmode='country names', # Use country names directly
                             color="Count",
@@ -76,7 +104,7 @@ def generate_country_map(countries_list, title):
                             color_continuous_scale=px.colors.sequential.Plasma,
                             title=title,
                             # Set a range to ensure the color scale is consistent
-                            range_color=[0, country_count['Count'].max()]
+                            range_color=[0, country_counts['Count'].max()]
                            )
         # Update layout to show all landmasses and fit bounds
         fig.update_layout(
@@ -96,6 +124,95 @@ def generate_country_map(countries_list, title):
         st.warning(f"Could not generate world map. Some country names might not be recognized: {e}")
         return None
 
+@st.fragment
+def render_period_tab(entries_key):
+    """Renders the Period Analysis tab as a fragment, so moving the year slider only reruns this tab."""
+    words_for_cloud, orgs, countries, years, authors = st.session_state.parsed_data
+
+    st.subheader("Select Period")
+    if not years.empty:
+        min_year = int(years.min())
+        max_year = int(years.max())
+        if min_year == max_year:
+            st.info(f"All results are from the year {min_year}. No period selection available.")
+            period = (min_year, max_year)
+        else:
+            # Use a key for the slider to maintain its state across reruns
+            period = st.slider("Year Range", min_value=min_year, max_value=max_year, value=(min_year, max_year), key="period_slider")
+            
+        # The full range selects every entry as long as each one has a publication year
+        if period == (min_year, max_year) and len(years) == len(st.session_state.entries):
+            # Reuse the Overview parse instead of filtering and parsing the same entries again
+            filtered_entries = st.session_state.entries
+            f_entries_key = entries_key
+            f_words_for_cloud, f_orgs, f_countries, f_years, f_authors = words_for_cloud, orgs, countries, years, authors
+        else:
+            # Filter entries based on the slider value
+            filtered_entries = filter_by_period(st.session_state.entries, period[0], period[1], years=st.session_state.entry_years)
+            f_entries_key = entries_cache_key(filtered_entries)
+            # Parse only the filtered entries for this tab
+            # Unpack parsed data - updated variable name
+            f_words_for_cloud, f_orgs, f_countries, f_years, f_authors = parse_results(filtered_entries)
+
+        # For the full range these are the Overview aggregates' cache keys, so nothing is recounted
+        f_author_counts = aggregate_counts(f_entries_key, f_authors, 'Author')
+        f_org_counts = aggregate_counts(f_entries_key, f_orgs, 'Organization')
+        f_country_counts = aggregate_counts(f_entries_key, f_countries, 'Country')
+        f_year_counts = aggregate_counts(f_entries_key, f_years, 'Year')
+
+        # Display filtered metrics and visualizations
+        col1_f, col2_f, col3_f, col4_f = st.columns(4)
+        with col1_f:
+            st.metric("Articles in Period", len(filtered_entries))
+        with col2_f:
+            st.metric("Authors in Period", f_authors.cat.categories.size)
+        with col3_f:
+            st.metric("Organizations in Period", f_orgs.cat.categories.size)
+        with col4_f:
+            st.metric("Countries in Period", f_countries.cat.categories.size)
+        
+        st.subheader("Word Cloud (Period - Keywords, Title, Description)") # Updated subheader
+        if not f_words_for_cloud.empty: # Use updated variable
+            wordcloud_image_f = generate_wordcloud_image(count_words(f_entries_key, f_words_for_cloud))
+            if wordcloud_image_f:
+                st.image(wordcloud_image_f)
+            else:
+                st.info("No words found in period for word cloud.") # Updated info message
+        
+        st.subheader("Top 25 Authors (Period)") # Moved Author Graph Section here
+        if not f_authors.empty:
+            fig_author_bar_f = generate_bar_chart(f_author_counts, 'Author', 'Top 25 Authors (Period)')
+            if fig_author_bar_f:
+                st.plotly_chart(fig_author_bar_f)
+            else:
+                st.info("No author data found in period.")
+            
+        if not f_orgs.empty:
+            fig_f = generate_bar_chart(f_org_counts, 'Organization', 'Top 25 Organizations (Period)')
+            if fig_f:
+                st.subheader("Top 25 Organizations (Period)")
+                st.plotly_chart(fig_f)
+            
+        st.subheader("Top 25 Countries (Period - Bar Chart)")
+        if not f_countries.empty:
+            fig_country_bar_f = generate_bar_chart(f_country_counts, 'Country', 'Top 25 Countries (Period)')
+            if fig_country_bar_f:
+                st.plotly_chart(fig_country_bar_f)
+            else:
+                st.info("No country data found in period.") 
+
+        st.subheader("Country Distribution (Period - World Map)")
+        if not f_countries.empty:
+            fig_country_map_f = generate_country_map(f_country_counts, 'Publication Distribution by Country (Period)')
+            if fig_country_map_f:
+                st.plotly_chart(fig_country_map_f)
+            
+        if not f_years.empty:
+            fig_f = generate_line_chart(f_year_counts, 'Publications by Year (Period)')
+            if fig_f:
+                st.subheader("Publications by Year (Period)")
+                st.plotly_chart(fig_f)
+
 # load environment variables from .env file
 dotenv.load_dotenv()
 
@@ -113,6 +230,8 @@ if 'entries' not in st.session_state:
     st.session_state.entries = None
 if 'parsed_data' not in st.session_state:
     st.session_state.parsed_data = None
+if 'entry_years' not in st.session_state:
+    st.session_state.entry_years = None
 if 'results_available' not in st.session_state:
     st.session_state.results_available = False
 
@@ -128,8 +247,6 @@ else:
 if not api_key:
     st.warning("API key not found. Please enter your API key above. If you don't trust this app, check the [github repo](%s) and run it locally" % "https://github.com/02loveslollipop/scopusBiblioSearch")
 
-api = controllers.ScopusAPI(api_key)    
-
 st.title("BiblioSearch")
 
 st.markdown("This app allows you to visualize bibliometric data from Scopus.")
@@ -155,7 +272,7 @@ if st.session_state.get("search_button"):
             
             # Perform search
             with st.spinner("Searching Scopus..."):
-                result = api.search_all(search_equation, total_count=search_limit)
+                result = cached_search(str(search_equation), search_limit, api_key)
                 entries = result.get('search-results', {}).get('entry', [])
             
             if not entries:
@@ -165,6 +282,7 @@ if st.session_state.get("search_button"):
                 st.session_state.displayed_results_count = None
                 st.session_state.entries = None
                 st.session_state.parsed_data = None
+                st.session_state.entry_years = None
                 st.session_state.results_available = False
             else:
                 # Store data in session state
@@ -176,6 +294,8 @@ if st.session_state.get("search_button"):
                 with st.spinner("Parsing results..."):
                     parsed_data = parse_results(entries)
                     st.session_state.parsed_data = parsed_data
+                    # Year per entry, computed once so the period slider only has to compare an array
+                    st.session_state.entry_years = entry_years(entries)
                 
                 st.session_state.results_available = True
                 # Rerun to display results immediately after search
@@ -196,44 +316,48 @@ if st.session_state.results_available and st.session_state.entries:
     # Unpack parsed data - updated variable name
     words_for_cloud, orgs, countries, years, authors = st.session_state.parsed_data 
     
+    # Key the cached aggregates on the result set once, instead of hashing every field on each rerun
+    entries_key = entries_cache_key(st.session_state.entries)
+
+    # Aggregate each field once, charts (and the full-range Period view) reuse these frames
+    author_counts = aggregate_counts(entries_key, authors, 'Author')
+    org_counts = aggregate_counts(entries_key, orgs, 'Organization')
+    country_counts = aggregate_counts(entries_key, countries, 'Country')
+    year_counts = aggregate_counts(entries_key, years, 'Year')
+    
     # Display metrics
     col1, col2, col3, col4 = st.columns(4)
     with col1:
         st.metric("Total Articles", len(st.session_state.entries))
     with col2:
-        st.metric("Unique Authors", len(set(authors)))
+        st.metric("Unique Authors", authors.cat.categories.size)
     with col3:
-        st.metric("Organizations", len(set(orgs)))
+        st.metric("Organizations", orgs.cat.categories.size)
     with col4:
-        st.metric("Countries", len(set(countries)))
+        st.metric("Countries", countries.cat.categories.size)
 
     # --- Add Export Buttons ---
     st.markdown("---") # Separator
-    st.subheader("Export Full Results")
-    
-    # Prepare data for export
-    export_df = pd.DataFrame(st.session_state.entries)
-    # Flatten potential list/dict columns for better CSV/JSON export if needed
-    # For simplicity, exporting raw entries for now. Complex structures might need flattening.
-    
-    csv_data = export_df.to_csv(index=False).encode('utf-8')
-    json_data = json.dumps(st.session_state.entries, indent=4)
-
-    col_export1, col_export2 = st.columns(2)
-    with col_export1:
-        st.download_button(
-            label="📥 Export as CSV",
-            data=csv_data,
-            file_name='scopus_results.csv',
-            mime='text/csv',
-        )
-    with col_export2:
-        st.download_button(
-            label="📥 Export as JSON",
-            data=json_data,
-            file_name='scopus_results.json',
-            mime='application/json',
-        )
+    with st.expander("Export Full Results"):
+        # Serialized once per distinct result set, reruns reuse the cached bytes
+        csv_data = entries_to_csv(entries_key, st.session_state.entries)
+        json_data = entries_to_json(entries_key, st.session_state.entries)
+
+        col_export1, col_export2 = st.columns(2)
+        with col_export1:
+            st.download_button(
+                label="📥 Export as CSV",
+                data=csv_data,
+                file_name='scopus_results.csv',
+                mime='text/csv',
+            )
+        with col_export2:
+            st.download_button(
+                label="📥 Export as JSON",
+                data=json_data,
+                file_name='scopus_results.json',
+                mime='application/json',
+            )
     st.markdown("---") # Separator
     # --- End Export Buttons ---
 
@@ -241,117 +365,49 @@ if st.session_state.results_available and st.session_state.entries:
     tab1, tab2, tab3 = st.tabs(["Overview", "Period Analysis", "Animations"])
     with tab1:
         st.subheader("Word Cloud (Keywords, Title, Description)") # Updated subheader
-        if words_for_cloud: # Use updated variable
-            fig = generate_wordcloud_figure(words_for_cloud) # Pass updated variable
-            if fig:
-                st.pyplot(fig)
+        if not words_for_cloud.empty: # Use updated variable
+            wordcloud_image = generate_wordcloud_image(count_words(entries_key, words_for_cloud))
+            if wordcloud_image:
+                st.image(wordcloud_image)
             else:
                 st.info("No words found in results for word cloud.") # Updated info message
             
         st.subheader("Top 25 Authors") # Moved Author Graph Section here
-        if authors:
-            fig_author_bar = generate_bar_chart(tuple(authors), 'Author', 'Top 25 Authors') # Use tuple
+        if not authors.empty:
+            fig_author_bar = generate_bar_chart(author_counts, 'Author', 'Top 25 Authors')
             if fig_author_bar:
                 st.plotly_chart(fig_author_bar)
             else:
                 st.info("No author data found.")
             
         st.subheader("Top 25 Organizations")
-        if orgs:
-            fig = generate_bar_chart(orgs, 'Organization', 'Top 25 Organizations')
+        if not orgs.empty:
+            fig = generate_bar_chart(org_counts, 'Organization', 'Top 25 Organizations')
             if fig:
                 st.plotly_chart(fig)
             
         st.subheader("Top 25 Countries (Bar Chart)")
-        if countries:
-            fig_country_bar = generate_bar_chart(tuple(countries), 'Country', 'Top 25 Countries') # Use tuple
+        if not countries.empty:
+            fig_country_bar = generate_bar_chart(country_counts, 'Country', 'Top 25 Countries')
             if fig_country_bar:
                 st.plotly_chart(fig_country_bar)
             else:
                 st.info("No country data found.") 
 
         st.subheader("Country Distribution (World Map)")
-        if countries:
-            fig_country_map = generate_country_map(tuple(countries), 'Publication Distribution by Country') # Use tuple
+        if not countries.empty:
+            fig_country_map = generate_country_map(country_counts, 'Publication Distribution by Country')
             if fig_country_map:
                 st.plotly_chart(fig_country_map)
             
         st.subheader("Publications by Year")
-        if years:
-            fig = generate_line_chart(years, 'Publications by Year')
+        if not years.empty:
+            fig = generate_line_chart(year_counts, 'Publications by Year')
             if fig:
                 st.plotly_chart(fig)
 
     with tab2:
-        st.subheader("Select Period")
-        if years:
-            min_year = min(years)
-            max_year = max(years)
-            if min_year == max_year:
-                st.info(f"All results are from the year {min_year}. No period selection available.")
-                filtered_entries = [e for e in st.session_state.entries if e.get('prism:coverDate', '').startswith(str(min_year))]
-            else:
-                # Use a key for the slider to maintain its state across reruns
-                period = st.slider("Year Range", min_value=min_year, max_value=max_year, value=(min_year, max_year), key="period_slider")
-                # Filter entries based on the slider value
-                filtered_entries = filter_by_period(st.session_state.entries, period[0], period[1])
-                
-            # Parse only the filtered entries for this tab
-            # Unpack parsed data - updated variable name
-            f_words_for_cloud, f_orgs, f_countries, f_years, f_authors = parse_results(filtered_entries)
-            
-            # Display filtered metrics and visualizations
-            col1_f, col2_f, col3_f, col4_f = st.columns(4)
-            with col1_f:
-                st.metric("Articles in Period", len(filtered_entries))
-            with col2_f:
-                st.metric("Authors in Period", len(set(f_authors)))
-            with col3_f:
-                st.metric("Organizations in Period", len(set(f_orgs)))
-            with col4_f:
-                st.metric("Countries in Period", len(set(f_countries)))
-            
-            st.subheader("Word Cloud (Period - Keywords, Title, Description)") # Updated subheader
-            if f_words_for_cloud: # Use updated variable
-                fig_f = generate_wordcloud_figure(f_words_for_cloud) # Pass updated variable
-                if fig_f:
-                    st.pyplot(fig_f)
-                else:
-                    st.info("No words found in period for word cloud.") # Updated info message
-            
-            st.subheader("Top 25 Authors (Period)") # Moved Author Graph Section here
-            if f_authors:
-                fig_author_bar_f = generate_bar_chart(tuple(f_authors), 'Author', 'Top 25 Authors (Period)') # Use tuple
-                if fig_author_bar_f:
-                    st.plotly_chart(fig_author_bar_f)
-                else:
-                    st.info("No author data found in period.")
-                
-            if f_orgs:
-                fig_f = generate_bar_chart(f_orgs, 'Organization', 'Top 25 Organizations (Period)')
-                if fig_f:
-                    st.subheader("Top 25 Organizations (Period)")
-                    st.plotly_chart(fig_f)
-                
-            st.subheader("Top 25 Countries (Period - Bar Chart)")
-            if f_countries:
-                fig_country_bar_f = generate_bar_chart(tuple(f_countries), 'Country', 'Top 25 Countries (Period)') # Use tuple
-                if fig_country_bar_f:
-                    st.plotly_chart(fig_country_bar_f)
-                else:
-                    st.info("No country data found in period.") 
-
-            st.subheader("Country Distribution (Period - World Map)")
-            if f_countries:
-                fig_country_map_f = generate_country_map(tuple(f_countries), 'Publication Distribution by Country (Period)') # Use tuple
-                if fig_country_map_f:
-                    st.plotly_chart(fig_country_map_f)
-                
-            if f_years:
-                fig_f = generate_line_chart(f_years, 'Publications by Year (Period)')
-                if fig_f:
-                    st.subheader("Publications by Year (Period)")
-                    st.plotly_chart(fig_f)
+        render_period_tab(entries_key)
 
     # --- New Animations Tab ---
     with tab3:
@@ -361,6 +417,10 @@ if st.session_state.results_available and st.session_state.entries:
             You can adjust the window size using the slider below.
         """)
 
+        from utils.animations import (parse_results_for_animation, prepare_rolling_data,
+                                      generate_animated_country_map, generate_animated_author_chart,
+                                      generate_animated_word_cloud_gif, calculate_max_window)
+
         # Prepare data for animations (run once)
         with st.spinner("Preparing data for animations..."):
             anim_df = parse_results_for_animation(st.session_state.entries)
@@ -382,7 +442,7 @@ if st.session_state.results_available and st.session_state.entries:
                 
                 # Generate rolling data with selected window size
                 country_anim_df, author_anim_df, word_anim_list, anim_months = prepare_rolling_data(
-                    anim_df, months_window=window_size
+                    entries_key, anim_df, months_window=window_size
                 )
                 
                 # Show a description of the selected rolling window
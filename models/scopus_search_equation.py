@@ -1,5 +1,9 @@
+import re
 from typing import Any
 
+# One pass for a standalone boolean operator (any case) or an empty field()
+_VALID_RE = re.compile(r'\b(?:AND|OR|NOT)\b|\(\)', re.IGNORECASE)
+
 class ScopusSearchEquation(str):
     """
     String wrapper for Scopus search equations. Validates basic structure.
@@ -15,6 +19,6 @@ class ScopusSearchEquation(str):
         if not self or not self.strip():
             raise ValueError("Search equation cannot be empty.")
         # Basic check: must contain at least one boolean operator or field()
-        if not any(op in self.upper() for op in self.BOOLEAN_OPERATORS) and '()' not in self:
+        if not _VALID_RE.search(self):
             raise ValueError("Search equation must contain at least one boolean operator or field().")
 
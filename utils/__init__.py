@@ -1,5 +1,10 @@
-from .parse_results import parse_results
-from .filter_by_period import filter_by_period
+from .parse_results import parse_results, ParsedResults
+from .filter_by_period import filter_by_period, entry_years
 from .limit_dataframe import limit_dataframe_for_graph
+from .entries_key import entries_cache_key
+from .flatten_entries import flatten_entries
+from .compact_entries import compact_entries
+from .tokenize_words import tokenize_words
+from .entries_soa import to_soa
 
-__all__ = ["parse_results", "filter_by_period", "extract_data", "limit_dataframe_for_graph"]
+__all__ = ["parse_results", "ParsedResults", "filter_by_period", "entry_years", "extract_data", "limit_dataframe_for_graph", "entries_cache_key", "flatten_entries", "compact_entries", "tokenize_words", "to_soa"]
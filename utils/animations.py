@@ -1,186 +1,225 @@
 import pandas as pd
+import numpy as np
 import plotly.express as px
-from datetime import datetime
-from dateutil.relativedelta import relativedelta
-import re
-from collections import Counter
 import io
-import imageio
+import os
+import hashlib
+import orjson
+from concurrent.futures import ProcessPoolExecutor
 from wordcloud import WordCloud
-import matplotlib.pyplot as plt
+from wordcloud.wordcloud import FONT_PATH
+from PIL import Image, ImageDraw, ImageFont
 import streamlit as st
+from .tokenize_words import tokenize_words
+from .entries_soa import to_soa, as_list, SOA_FIELDS
 
 def parse_results_for_animation(entries):
     """Extracts date, country, author, and words for each entry."""
-    data = []
-    for entry in entries:
-        # Extract date
-        date_str = entry.get('prism:coverDate')
+    return _parse_results_for_animation_cached(_animation_content_key(entries), entries)
+
+def _animation_content_key(entries):
+    """Digest of every field the animation parser reads, so corrected entries with the same ids are parsed again"""
+    fields = [[entry.get(field) for field in SOA_FIELDS] for entry in entries]
+    return hashlib.blake2b(orjson.dumps(fields), digest_size=16).hexdigest()
+
+# Parsed frames are also kept on disk, in a directory owned by the app, so a query reloaded in a new session or process skips the parse
+ANIMATION_CACHE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), '.cache', 'animations')
+# Bump whenever _parse_results_for_animation_impl changes its output, frames written by older code are then never read
+ANIMATION_CACHE_VERSION = 1
+# Most recently used frames kept on disk, older ones are deleted after each write
+ANIMATION_CACHE_MAX_FILES = 32
+_LIST_COLUMNS = ('countries', 'authors', 'words')
+
+def _prune_animation_cache():
+    """Deletes all but the ANIMATION_CACHE_MAX_FILES most recently used frames, including those of older cache versions"""
+    paths = [entry.path for entry in os.scandir(ANIMATION_CACHE_DIR) if entry.name.endswith('.parquet')]
+    paths.sort(key=os.path.getmtime, reverse=True)
+    for path in paths[ANIMATION_CACHE_MAX_FILES:]:
+        os.remove(path)
+
+@st.cache_data(show_spinner=False, max_entries=32)
+def _parse_results_for_animation_cached(content_key, _entries):
+    cache_path = os.path.join(ANIMATION_CACHE_DIR, f"v{ANIMATION_CACHE_VERSION}_{content_key}.parquet")
+    try:
+        df = pd.read_parquet(cache_path)
+        os.utime(cache_path) # Mark as recently used for pruning
+        # Parquet gives list cells back as arrays, return the same lists as a fresh parse
+        for column in _LIST_COLUMNS:
+            df[column] = df[column].map(list)
+        return df
+    except (OSError, ValueError, KeyError, ImportError):
+        pass # Not cached yet, unreadable or no Parquet engine installed, parse below
+
+    df = _parse_results_for_animation_impl(_entries)
+    # Write then rename, so a concurrent session never reads a partial file
+    partial_path = f"{cache_path}.{os.getpid()}.tmp"
+    try:
+        os.makedirs(ANIMATION_CACHE_DIR, mode=0o700, exist_ok=True)
+        df.to_parquet(partial_path, compression='zstd')
+        os.replace(partial_path, cache_path)
+        _prune_animation_cache()
+    except (OSError, ValueError, ImportError):
+        # The disk cache is optional, the in-memory cache still holds the frame
         try:
-            # Handle cases like '2023', '2023-05', '2023-05-15'
-            if date_str:
-                if len(date_str) == 4: # Year only
-                    date = datetime.strptime(f"{date_str}-01-01", '%Y-%m-%d')
-                elif len(date_str) == 7: # Year-Month
-                     date = datetime.strptime(f"{date_str}-01", '%Y-%m-%d')
-                else: # Full date
-                    date = datetime.strptime(date_str, '%Y-%m-%d')
-            else:
-                date = None # Skip entries without date for time-based animation
-        except (ValueError, TypeError):
-            date = None # Skip entries with invalid date format
-
-        if not date:
-            continue
+            os.remove(partial_path)
+        except OSError:
+            pass
+    return df
 
-        # Extract country
-        countries_entry = []
-        if 'affiliation' in entry:
-            affiliations = entry['affiliation']
-            if isinstance(affiliations, list):
-                for aff in affiliations:
-                    if isinstance(aff, dict) and 'affiliation-country' in aff:
-                        countries_entry.append(aff['affiliation-country'])
-            elif isinstance(affiliations, dict) and 'affiliation-country' in affiliations:
-                countries_entry.append(affiliations['affiliation-country'])
-
-        # Extract author
-        authors_entry = []
-        author_found = False
-        if 'author' in entry:
-            entry_authors = entry['author']
-            if isinstance(entry_authors, list):
-                for author in entry_authors:
-                    if isinstance(author, dict) and 'authname' in author:
-                        authors_entry.append(author['authname'])
-                        author_found = True
-            elif isinstance(entry_authors, dict) and 'authname' in entry_authors:
-                authors_entry.append(entry_authors['authname'])
-                author_found = True
-        if not author_found and 'dc:creator' in entry:
-             creator_name = entry.get('dc:creator')
-             if creator_name and isinstance(creator_name, str):
-                 authors_entry.append(creator_name)
-
-        # Extract words (unique per article)
-        article_unique_words = set()
-        # Keywords
-        if 'authkeywords' in entry:
-            keywords_str = entry.get('authkeywords', "") or ""
-            entry_keywords = keywords_str.split(' | ')
-            for keyword in entry_keywords:
-                 # Basic cleaning: lower, strip whitespace
-                cleaned_keyword = keyword.strip().lower()
-                if cleaned_keyword:
-                    article_unique_words.add(cleaned_keyword)
-        # Title
-        title = entry.get('dc:title', "") or ""
-        words_title = re.findall(r'\b\w+\b', title.lower())
-        article_unique_words.update(words_title)
-        # Description
-        description = entry.get('dc:description', "") or ""
-        words_desc = re.findall(r'\b\w+\b', description.lower())
-        article_unique_words.update(words_desc)
-
-        # Add data for this entry
-        data.append({
-            'date': date,
-            'countries': list(set(countries_entry)), # Unique countries for this entry
-            'authors': list(set(authors_entry)),     # Unique authors for this entry
-            'words': list(article_unique_words)
-        })
-
-    if not data:
+def _parse_results_for_animation_impl(entries):
+    soa = to_soa(entries)
+    if len(soa['date']) == 0:
         return pd.DataFrame(columns=['date', 'countries', 'authors', 'words'])
 
-    # Create DataFrame with lists, then process each animation separately
-    df = pd.DataFrame(data)
-    df = df.dropna(subset=['date']) # Ensure date is present
-    df['date'] = pd.to_datetime(df['date'])
+    # Dates come parsed from to_soa, entries without a valid date are skipped before any other work
+    valid = ~np.isnat(soa['date'])
+    soa = {column: values[valid] for column, values in soa.items()}
+    n_entries = int(valid.sum())
+
+    # Lowercase and tokenize the text of the whole corpus at once, per-entry work below only merges the results
+    keyword_lists = pd.Series(soa['keywords'], dtype=object).str.lower().str.split(' | ', regex=False)
+    text = pd.Series(soa['title'], dtype=object).fillna('') + ' ' + pd.Series(soa['description'], dtype=object).fillna('')
+    text_words = text.str.lower().map(tokenize_words)
+
+    # One preallocated object column per field, filled in place
+    countries = np.empty(n_entries, dtype=object)
+    authors = np.empty(n_entries, dtype=object)
+    words = np.empty(n_entries, dtype=object)
+    for i, (affiliations, entry_authors, creator_name, entry_keywords, entry_text_words) in enumerate(zip(
+            soa['affiliations'], soa['authors'], soa['creator'], keyword_lists, text_words)):
+        # Extract countries and authors with the same field handling as parse_results
+        # Collected straight into sets, unique per entry
+        countries_entry = {aff['affiliation-country'] for aff in as_list(affiliations)
+                           if isinstance(aff, dict) and 'affiliation-country' in aff}
+        authors_entry = {author['authname'] for author in as_list(entry_authors)
+                         if isinstance(author, dict) and 'authname' in author}
+        # Fall back to 'dc:creator' for entries without author names
+        if not authors_entry and creator_name and isinstance(creator_name, str):
+            authors_entry.add(creator_name)
+
+        # Extract words (unique per article): stripped keywords, then title and description words
+        article_unique_words = set()
+        if isinstance(entry_keywords, list):
+            article_unique_words.update(keyword.strip() for keyword in entry_keywords if keyword.strip())
+        article_unique_words.update(entry_text_words)
+
+        countries[i] = list(countries_entry) # Unique countries for this entry
+        authors[i] = list(authors_entry)     # Unique authors for this entry
+        words[i] = list(article_unique_words)
+
+    df = pd.DataFrame({
+        'date': soa['date'].astype('datetime64[ns]'),
+        'countries': countries,
+        'authors': authors,
+        'words': words,
+    })
     df = df.sort_values('date')
     return df
 
 
-def prepare_rolling_data(df, months_window=6):
-    """Calculates rolling counts/frequencies over a specified window."""
-    if df.empty:
-        return pd.DataFrame(), pd.DataFrame(), [], []
+def _rolling_window_sum(counts, window):
+    """Sums counts over the trailing window of rows ending at each row (month), via a cumulative sum"""
+    cumulative = np.concatenate([np.zeros((1,) + counts.shape[1:], dtype=np.int64), np.cumsum(counts, axis=0)])
+    starts = np.maximum(np.arange(1, len(counts) + 1) - window, 0)
+    return cumulative[1:] - cumulative[starts]
+
+def _flatten_by_month(values, month_idx):
+    """Flattens a column of lists into factorized (codes, categories, months) arrays, skipping missing and empty strings"""
+    lengths = np.fromiter(map(len, values), dtype=np.int64, count=len(values))
+    flat = np.array([value for row in values for value in row], dtype=object)
+    months = np.repeat(month_idx, lengths)
+    keep = pd.notna(flat) & (flat != '')
+    codes, categories = pd.factorize(flat[keep])
+    return codes, categories, months[keep]
+
+@st.cache_data(show_spinner=False, max_entries=32)
+def _monthly_values(entries_key, _df):
+    """Window-independent stage of prepare_rolling_data: month index and flattened values of every entry, once per entries_key"""
+    min_date = _df['date'].min()
+    # Month index of every entry, counted from the first month in the data
+    dates = _df['date']
+    month_idx = ((dates.dt.year - min_date.year) * 12 + (dates.dt.month - min_date.month)).to_numpy()
+    n_months = int(month_idx.max()) + 1
+    month_labels = pd.period_range(start=min_date.to_period('M'), periods=n_months, freq='M').strftime('%Y-%m')
+    return {
+        'month_idx': month_idx,
+        'n_months': n_months,
+        'month_labels': np.asarray(month_labels, dtype=object),
+        'countries': _flatten_by_month(_df['countries'], month_idx),
+        'authors': _flatten_by_month(_df['authors'], month_idx),
+        'words': _flatten_by_month(_df['words'], month_idx),
+    }
+
+def _rolling_category_counts(flattened, n_months, window, frame_months, month_labels, column_name, top_n=None):
+    """Long [column_name, 'Count', 'Month'] frame of rolling counts per frame month, most frequent first"""
+    codes, categories, months = flattened
+    if len(codes) == 0:
+        return pd.DataFrame(columns=[column_name, 'Count', 'Month'])
+
+    # Count each category per month in one bincount over flat (month, category) cells, then roll the window over the month axis
+    monthly = np.bincount(months * len(categories) + codes, minlength=n_months * len(categories)).reshape(n_months, len(categories))
+    rolling = _rolling_window_sum(monthly, window)[frame_months]
+
+    # Flatten to long format, ordered by month then count (descending)
+    frame_pos, category = np.nonzero(rolling)
+    count = rolling[frame_pos, category]
+    order = np.lexsort((category, -count, frame_pos))
+    frame_pos, category, count = frame_pos[order], category[order], count[order]
+    if top_n is not None:
+        # Rank within each month, the rows of one month are contiguous after the sort
+        first_in_month = np.searchsorted(frame_pos, frame_pos, side='left')
+        keep = np.arange(len(frame_pos)) - first_in_month < top_n
+        frame_pos, category, count = frame_pos[keep], category[keep], count[keep]
+
+    # Names stay categorical on the factorized codes, no string gather per row
+    return pd.DataFrame({
+        column_name: pd.Categorical.from_codes(category, categories),
+        'Count': count.astype(np.int64),
+        'Month': month_labels[frame_months[frame_pos]],
+    })
+
+def _rolling_top_words(flattened, window, frame_months, month_labels, top_n=100):
+    """[{'Month', 'WordCounts'}] with the top_n words of each frame's rolling window, frames without words are skipped"""
+    codes, vocabulary, months = flattened
+    if len(codes) == 0:
+        return []
+    # Entries are sorted by date, so every window is one contiguous slice of the flattened words
+
+    # Bounds of every frame's slice in one searchsorted call, a per-frame call costs more than the counting itself
+    starts, ends = np.searchsorted(months, np.stack([frame_months - window + 1, frame_months + 1]))
 
-    df = df.copy() # Create a copy to avoid SettingWithCopyWarning
-    min_date = df['date'].min()
-    max_date = df['date'].max()
-
-    if pd.isna(min_date) or pd.isna(max_date):
-         return pd.DataFrame(), pd.DataFrame(), [], []
-
-    # Create monthly periods for animation frames
-    # Ensure the range includes the last month properly
-    periods = pd.date_range(start=min_date.to_period('M').to_timestamp(),
-                            end=max_date.to_period('M').to_timestamp() + pd.offsets.MonthEnd(0),
-                            freq='M')
-
-    rolling_country_data = []
-    rolling_author_data = []
     rolling_word_data = []
-
-    for period_end_date in periods:
-        period_start_date = period_end_date - relativedelta(months=months_window - 1)
-        period_start_date = period_start_date.replace(day=1) # Start of the month
-
-        # Filter data within the rolling window [period_start_date, period_end_date]
-        window_df = df[(df['date'] >= period_start_date) & (df['date'] <= period_end_date)]
-
-        if window_df.empty:
+    for month, start, end in zip(frame_months.tolist(), starts.tolist(), ends.tolist()):
+        if start == end:
             continue
+        counts = np.bincount(codes[start:end], minlength=len(vocabulary))
+        present = np.flatnonzero(counts)
+        # Most frequent first, ties in order of first appearance
+        top = present[np.lexsort((present, -counts[present]))][:top_n]
+        rolling_word_data.append({'Month': month_labels[month], 'WordCounts': dict(zip(vocabulary[top], counts[top].tolist()))})
+    return rolling_word_data
+
+@st.cache_data(show_spinner=False, max_entries=32)
+def prepare_rolling_data(entries_key, _df, months_window=6):
+    """Calculates rolling counts/frequencies over a specified window, once per (entries_key, months_window)."""
+    if _df.empty or _df['date'].isna().all():
+        return pd.DataFrame(), pd.DataFrame(), [], []
 
-        month_str = period_end_date.strftime('%Y-%m')
+    # The heavy flattening is cached per entries_key, changing the window only redoes the rolling sums below
+    monthly = _monthly_values(entries_key, _df)
+    month_idx, n_months, month_labels = monthly['month_idx'], monthly['n_months'], monthly['month_labels']
 
-        # Country counts
-        country_counts = []
-        for _, row in window_df.iterrows():
-            for country in row['countries']:
-                if country:  # Skip empty strings
-                    country_counts.append(country)
-        
-        if country_counts:
-            country_df = pd.DataFrame({'Country': country_counts})
-            country_counts = country_df['Country'].value_counts().reset_index()
-            country_counts.columns = ['Country', 'Count']
-            country_counts['Month'] = month_str
-            rolling_country_data.append(country_counts)
-
-        # Author counts
-        author_counts = []
-        for _, row in window_df.iterrows():
-            for author in row['authors']:
-                if author:  # Skip empty strings
-                    author_counts.append(author)
-        
-        if author_counts:
-            author_df = pd.DataFrame({'Author': author_counts})
-            author_counts = author_df['Author'].value_counts().reset_index()
-            author_counts.columns = ['Author', 'Count']
-            # Get top N authors for the frame
-            top_authors = author_counts.nlargest(25, 'Count')
-            top_authors['Month'] = month_str
-            rolling_author_data.append(top_authors)
-
-        # Word counts
-        word_counts = Counter()
-        for _, row in window_df.iterrows():
-            for word in row['words']:
-                if word:  # Skip empty strings
-                    word_counts[word] += 1
-        
-        # Keep top N words for the frame (e.g., top 100 for word cloud)
-        top_words = dict(word_counts.most_common(100))
-        if top_words:  # Only add if there are words
-             rolling_word_data.append({'Month': month_str, 'WordCounts': top_words})
+    # Only months whose rolling window [month - months_window + 1, month] holds any entry produce a frame
+    entries_in_window = _rolling_window_sum(np.bincount(month_idx, minlength=n_months), months_window)
+    frame_months = np.flatnonzero(entries_in_window)
 
+    # Country and author counts for every window at once, from a (month x category) count matrix
+    all_country_df = _rolling_category_counts(monthly['countries'], n_months, months_window, frame_months, month_labels, 'Country')
+    all_author_df = _rolling_category_counts(monthly['authors'], n_months, months_window, frame_months, month_labels, 'Author', top_n=25)
+
+    # Word counts, top 100 per frame for the word cloud
+    rolling_word_data = _rolling_top_words(monthly['words'], months_window, frame_months, month_labels, top_n=100)
 
-    all_country_df = pd.concat(rolling_country_data, ignore_index=True) if rolling_country_data else pd.DataFrame(columns=['Country', 'Count', 'Month'])
-    all_author_df = pd.concat(rolling_author_data, ignore_index=True) if rolling_author_data else pd.DataFrame(columns=['Author', 'Count', 'Month'])
-    
     # Get list of unique months
     months = []
     if not all_country_df.empty and 'Month' in all_country_df.columns:
@@ -216,7 +255,7 @@ def calculate_max_window(df):
 
 
 # --- Function: Generate Animated Country Map (Plotly) ---
-@st.cache_data(show_spinner=False)
+@st.cache_resource(show_spinner=False, max_entries=16) # Shared figure, not unpickled on every rerun
 def generate_animated_country_map(country_df, window_size=6):
     """Generates an animated choropleth map of publication counts by country."""
     if country_df.empty or 'Month' not in country_df.columns:
@@ -261,7 +300,7 @@ def generate_animated_country_map(country_df, window_size=6):
         return None
 
 # --- Function: Generate Animated Author Bar Chart (Plotly) ---
-@st.cache_data(show_spinner=False)
+@st.cache_resource(show_spinner=False, max_entries=16) # Shared figure, not unpickled on every rerun
 def generate_animated_author_chart(author_df, window_size=6):
     """Generates an animated bar chart of publication counts by author."""
     if author_df.empty or 'Month' not in author_df.columns:
@@ -271,7 +310,7 @@ def generate_animated_author_chart(author_df, window_size=6):
     months = author_df['Month'].unique()
     
     # Find the global top 25 authors across all months for consistent ordering
-    top_global_authors = author_df.groupby('Author')['Count'].sum().nlargest(25).index.tolist()
+    top_global_authors = author_df.groupby('Author', observed=True)['Count'].sum().nlargest(25).index.tolist()
     
     # If we have less than 25 authors, use all available
     if len(top_global_authors) < 25:
@@ -289,31 +328,15 @@ def generate_animated_author_chart(author_df, window_size=6):
     # Format window description for title
     window_desc = f"{window_size}-Month" if window_size > 1 else "Monthly"
     
-    # Create a complete dataframe with all top authors for each month (filling missing values with 0)
-    complete_df = []
-    
-    for month in months:
-        month_data = author_df[author_df['Month'] == month]
-        month_authors = set(month_data['Author'].tolist())
-        
-        # Add existing authors
-        complete_df.append(month_data)
-        
-        # Add missing top authors with count 0
-        missing_authors = [author for author in top_global_authors if author not in month_authors]
-        if missing_authors:
-            missing_df = pd.DataFrame({
-                'Author': missing_authors,
-                'Count': [0] * len(missing_authors),
-                'Month': [month] * len(missing_authors)
-            })
-            complete_df.append(missing_df)
-    
-    if not complete_df:
-        return None
-    
-    # Combine all dataframes
-    complete_author_df = pd.concat(complete_df, ignore_index=True)
+    # Complete every month with the top authors it lacks at count 0, from one (month x author) grid instead of a per-month filter
+    grid = pd.MultiIndex.from_product([months, top_global_authors], names=['Month', 'Author'])
+    missing = grid[~grid.isin(pd.MultiIndex.from_frame(author_df[['Month', 'Author']]))].to_frame(index=False)
+    missing_df = pd.DataFrame({'Author': missing['Author'], 'Count': 0, 'Month': missing['Month']})
+
+    # Each month's existing rows, then its missing authors, months in their original order
+    complete_author_df = pd.concat([author_df, missing_df], ignore_index=True)
+    month_order = pd.Categorical(complete_author_df['Month'], categories=months).codes
+    complete_author_df = complete_author_df.iloc[np.argsort(month_order, kind='stable')].reset_index(drop=True)
     
     try:
         # Create the bar chart with custom category ordering
@@ -347,7 +370,41 @@ def generate_animated_author_chart(author_df, window_size=6):
         return None
 
 
-# --- Function: Generate Animated Word Cloud (Matplotlib/Imageio) ---
+# --- Function: Generate Animated Word Cloud (Pillow) ---
+FRAME_SIZE = (800, 430) # 800x400 word cloud below a title band
+TITLE_HEIGHT = FRAME_SIZE[1] - 400
+
+_frame_word_cloud = None # One WordCloud per worker process, reused for every frame it renders
+
+def _get_frame_word_cloud():
+    global _frame_word_cloud
+    if _frame_word_cloud is None:
+        # Layout is computed at 400x200 and drawn at twice the size, sharper than upscaling the image
+        _frame_word_cloud = WordCloud(width=400, height=200, scale=2, background_color='white', random_state=0)
+    # Reseed the shared RNG so each frame's layout depends only on its word counts, not on the frames rendered before it
+    _frame_word_cloud.random_state.seed(0)
+    return _frame_word_cloud
+
+def _text_image(text, size, fill='black', font_size=14):
+    """White image with text centered on it."""
+    image = Image.new('RGB', size, 'white')
+    draw = ImageDraw.Draw(image)
+    font = ImageFont.truetype(FONT_PATH, font_size)
+    draw.multiline_text((size[0] / 2, size[1] / 2), text, fill=fill, font=font, anchor='mm', align='center')
+    return image
+
+def _render_word_cloud_frame(word_counts, title):
+    """Renders a single word cloud frame, runs in a worker process."""
+    frame = Image.new('RGB', FRAME_SIZE, 'white')
+    frame.paste(_text_image(title, (FRAME_SIZE[0], TITLE_HEIGHT)), (0, 0))
+    if word_counts:
+        body = _get_frame_word_cloud().generate_from_frequencies(word_counts).to_image()
+    else:
+        # Placeholder text for empty frames
+        body = _text_image('No data for this period', (FRAME_SIZE[0], FRAME_SIZE[1] - TITLE_HEIGHT))
+    frame.paste(body, (0, TITLE_HEIGHT))
+    return frame
+
 @st.cache_data(show_spinner=False)
 def generate_animated_word_cloud_gif(word_data_list, window_size=6):
     """Generates an animated GIF of word clouds over time."""
@@ -363,57 +420,19 @@ def generate_animated_word_cloud_gif(word_data_list, window_size=6):
         months = [item['Month'] for item in word_data_list]
         word_counts_per_month = [item['WordCounts'] for item in word_data_list]
 
-        fig, ax = plt.subplots(figsize=(8, 4))
-        plt.tight_layout(pad=0) # Reduce padding
-        ax.axis("off") # Turn off axis
-
-        images = [] # List to store frames for GIF
-
-        # Pre-generate all wordclouds to avoid issues within FuncAnimation
-        wc_objects = []
-        for word_counts in word_counts_per_month:
-             if word_counts:
-                 wc = WordCloud(width=400, height=200, background_color='white').generate_from_frequencies(word_counts)
-                 wc_objects.append(wc)
-             else:
-                 # Handle empty frames - maybe generate an empty image or skip
-                 wc_objects.append(None) # Placeholder for empty
-
-        # Create frames
-        for i, wc in enumerate(wc_objects):
-            ax.clear() # Clear previous frame
-            ax.axis("off")
-            if wc:
-                 ax.imshow(wc, interpolation="bilinear")
-            else:
-                 # Display placeholder text for empty frames
-                 ax.text(0.5, 0.5, 'No data for this period', horizontalalignment='center', verticalalignment='center', transform=ax.transAxes)
-
-            ax.set_title(f"Word Cloud ({window_desc} Rolling) - {months[i]}", fontsize=10)
-            fig.canvas.draw() # Draw the canvas, cache the renderer
-
-            # Convert plot to image data
-            image = io.BytesIO()
-            plt.savefig(image, format='png', bbox_inches='tight', pad_inches=0.1)
-            image.seek(0)
-            images.append(imageio.imread(image))
-
-        plt.close(fig) # Close the figure after loop
-
-        # Save frames as GIF
+        titles = [f"Word Cloud ({window_desc} Rolling) - {month}" for month in months]
+
+        # Render the frames in worker processes (no more workers than frames), then encode them with Pillow directly
+        n_workers = min(len(word_counts_per_month), os.cpu_count() or 1)
+        with ProcessPoolExecutor(max_workers=n_workers) as pool:
+            frames = list(pool.map(_render_word_cloud_frame, word_counts_per_month, titles))
         gif_bytes = io.BytesIO()
-        imageio.mimsave(gif_bytes, images, duration=1.0, format='GIF') # duration in seconds per frame
-        gif_bytes.seek(0)
+        frames[0].save(gif_bytes, format='GIF', save_all=True, append_images=frames[1:], duration=1000, loop=0) # ms per frame
         return gif_bytes.getvalue()
 
     except Exception as e:
         st.warning(f"Could not generate animated word cloud GIF: {e}")
         # Fallback or error indication
-        fig, ax = plt.subplots(figsize=(8, 4))
-        ax.text(0.5, 0.5, f"Word Cloud Animation Failed:\n{e}", horizontalalignment='center', verticalalignment='center', transform=ax.transAxes, color='red')
-        ax.axis("off")
         buf = io.BytesIO()
-        plt.savefig(buf, format='png')
-        plt.close(fig)
-        buf.seek(0)
+        _text_image(f"Word Cloud Animation Failed:\n{e}", (800, 400), fill='red').save(buf, format='PNG')
         return buf.getvalue()
\ No newline at end of file
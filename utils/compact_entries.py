@@ -0,0 +1,27 @@
+# Fields whose values repeat across entries: document types, sources, dates, counts, names and countries.
+# Keep in sync with ScopusAPI.DEFAULT_FIELDS, every key is one of its fields or an attribute of the requested 'link' records
+REPEATED_FIELDS = frozenset({
+    '@_fa', '@ref', 'prism:aggregationType', 'subtype', 'subtypeDescription', 'prism:publicationName',
+    'prism:issn', 'prism:eIssn', 'source-id', 'prism:volume', 'prism:coverDate', 'prism:coverDisplayDate',
+    'openaccess', 'citedby-count', 'dc:creator', 'authname', 'affilname', 'affiliation-city', 'affiliation-country',
+})
+
+def compact_entries(entries):
+    """Share one string object per distinct value of the repetitive fields (in place), so duplicates are stored once"""
+    pool = {}
+
+    def compact(record):
+        for key, value in record.items():
+            if isinstance(value, str):
+                if key in REPEATED_FIELDS:
+                    record[key] = pool.setdefault(value, value)
+            elif isinstance(value, dict):
+                compact(value)
+            elif isinstance(value, list):
+                for item in value:
+                    if isinstance(item, dict):
+                        compact(item)
+
+    for entry in entries:
+        compact(entry)
+    return entries
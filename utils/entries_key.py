@@ -0,0 +1,6 @@
+import hashlib
+
+def entries_cache_key(entries):
+    """Build a short, stable cache key for a list of Scopus entries from their identifiers"""
+    identifiers = '\n'.join(entry.get('dc:identifier') or entry.get('eid', '') for entry in entries)
+    return hashlib.blake2b(identifiers.encode('utf-8'), digest_size=16).hexdigest()
@@ -0,0 +1,30 @@
+import pandas as pd
+
+# Entry fields read by the parsers, and the column each one is stored under
+SOA_FIELDS = {
+    'dc:title': 'title',
+    'dc:description': 'description',
+    'authkeywords': 'keywords',
+    'prism:coverDate': 'cover_date',
+    'dc:creator': 'creator',
+    'author': 'authors',
+    'affiliation': 'affiliations',
+}
+
+def as_list(value):
+    """Scopus returns multi-valued fields either as a list of dicts or, for a single value, as a bare dict"""
+    if isinstance(value, list):
+        return value
+    if isinstance(value, dict):
+        return [value]
+    return []
+
+def to_soa(entries):
+    """Extract the parsed fields of Scopus entries once, as one object array per field (None where missing) plus parsed dates"""
+    soa = {
+        column: pd.Series([entry.get(field) for entry in entries], dtype=object).to_numpy()
+        for field, column in SOA_FIELDS.items()
+    }
+    # '2023', '2023-05' and '2023-05-15' cover dates, NaT where missing or invalid
+    soa['date'] = pd.to_datetime(soa['cover_date'], format='ISO8601', errors='coerce').to_numpy(dtype='datetime64[D]')
+    return soa
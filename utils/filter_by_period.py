@@ -1,9 +1,17 @@
-def filter_by_period(entries, start_year, end_year):
-    """Filter Scopus entries by publication year"""
-    filtered = []
-    for entry in entries:
-        if 'prism:coverDate' in entry:
-            year = int(entry['prism:coverDate'].split('-')[0])
-            if start_year <= year <= end_year:
-                filtered.append(entry)
-    return filtered
+import numpy as np
+from itertools import compress
+
+def entry_years(entries):
+    """Publication year of each Scopus entry as an int16 array, -1 where the cover date has no year"""
+    # A 4-character unicode array truncates every cover date to its year prefix in C
+    years = np.array([entry.get('prism:coverDate') or '' for entry in entries], dtype='U4')
+    has_year = np.char.isdigit(years)
+    result = np.full(len(years), -1, dtype=np.int16)
+    result[has_year] = years[has_year].astype(np.int16)
+    return result
+
+def filter_by_period(entries, start_year, end_year, years=None):
+    """Filter Scopus entries by publication year, optionally using years precomputed with entry_years"""
+    if years is None:
+        years = entry_years(entries)
+    return list(compress(entries, (years >= start_year) & (years <= end_year)))
@@ -0,0 +1,50 @@
+import pandas as pd
+from .entries_soa import as_list
+
+# Multi-valued fields exported as '; '-joined columns, one per nested key
+NESTED_FIELDS = {
+    'affiliation': ['affilname', 'affiliation-country'],
+    'author': ['authname'],
+}
+INT_FIELDS = {'citedby-count'}
+# API links to the article pages, no bibliographic data
+DROPPED_FIELDS = {'link'}
+
+def _text_values(value):
+    """Text of a Scopus value record: the '$' of {'@_fa': ..., '$': ...} dicts, found through nested lists and dicts"""
+    if isinstance(value, list):
+        return [text for item in value for text in _text_values(item)]
+    if isinstance(value, dict):
+        if '$' in value:
+            return [str(value['$'])]
+        return [text for item in value.values() if isinstance(item, (list, dict)) for text in _text_values(item)]
+    return [] if pd.isna(value) else [str(value)]
+
+def _join_text_values(value):
+    texts = _text_values(value)
+    return '; '.join(texts) if texts else None
+
+def flatten_entries(entries):
+    """Flatten Scopus entries into a typed, one-row-per-article DataFrame for CSV export"""
+    df = pd.DataFrame(entries)
+    flat = {}
+    for column in df.columns:
+        values = df[column]
+        if column in NESTED_FIELDS:
+            items = values.map(as_list).explode()
+            for key in NESTED_FIELDS[column]:
+                names = items.str.get(key).dropna().astype(str)
+                flat[key] = names.groupby(level=0).agg('; '.join).reindex(df.index)
+        elif column in DROPPED_FIELDS:
+            continue
+        elif values.map(lambda value: isinstance(value, (list, dict))).any():
+            # Other value records (ISBNs, open access labels, ...) are exported as '; '-joined text
+            flat[column] = values.map(_join_text_values)
+        elif column in INT_FIELDS:
+            flat[column] = pd.to_numeric(values, errors='coerce').astype('Int32')
+        elif values.nunique() < len(values) / 2:
+            # Repetitive fields (document type, source title, ...) are stored once per distinct value
+            flat[column] = values.astype('category')
+        else:
+            flat[column] = values
+    return pd.DataFrame(flat, copy=False)
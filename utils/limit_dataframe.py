@@ -1,6 +1,14 @@
+import numpy as np
+
 def limit_dataframe_for_graph(df, count_column, name_column, top_n=25):
     """Limit dataframe to top N entries based on count"""
     if len(df) > top_n:
-        top_entries = df.nlargest(top_n, count_column)
+        # Same rows and order as df.nlargest(top_n, count_column), selected with an O(N) partition instead of a sort
+        values = df[count_column].to_numpy()
+        threshold = np.partition(values, len(values) - top_n)[len(values) - top_n]
+        above = np.flatnonzero(values > threshold)
+        ties = np.flatnonzero(values == threshold)[:top_n - len(above)]  # keep='first' among counts equal to the cutoff
+        top = np.concatenate([above, ties])
+        top_entries = df.iloc[top[np.argsort(-values[top], kind='stable')]]
         return top_entries
-    return df
\ No newline at end of file
+    return df
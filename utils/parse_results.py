@@ -1,84 +1,62 @@
-import re
+import pandas as pd
+import streamlit as st
+from typing import NamedTuple
+from .entries_key import entries_cache_key
+from .tokenize_words import tokenize_words
+from .entries_soa import to_soa, as_list
+
+class ParsedResults(NamedTuple):
+    """Columnar parse output, one Series per field (authors, orgs and countries are categoricals)"""
+    words: pd.Series
+    orgs: pd.Series
+    countries: pd.Series
+    years: pd.Series
+    authors: pd.Series
+
+def _as_category(values):
+    """Categorical with categories in order of first appearance, so counts tie-break like Counter"""
+    values = values.reset_index(drop=True)
+    return values.astype(pd.CategoricalDtype(pd.unique(values)))
 
 def parse_results(entries):
     """Extract unique words (from keywords, title, description), affiliations, countries, years, and authors from Scopus entries"""
-    all_words_for_cloud = []
-    orgs = []
-    countries = []
-    years = []
-    authors = []
-
-    for entry in entries:
-        article_unique_words = set()
-
-        # Extract and process keywords
-        if 'authkeywords' in entry:
-            keywords_str = entry['authkeywords'] or ""
-            entry_keywords = keywords_str.split(' | ')
-            for keyword in entry_keywords:
-                cleaned_keyword = keyword.strip().lower()
-                if cleaned_keyword:
-                    article_unique_words.add(cleaned_keyword)
-
-        # Extract and process title
-        if 'dc:title' in entry:
-            title = entry['dc:title'] or ""
-            words = re.findall(r'\b\w+\b', title.lower())
-            article_unique_words.update(words)
-
-        # Extract and process description
-        if 'dc:description' in entry:
-            description = entry['dc:description'] or ""
-            words = re.findall(r'\b\w+\b', description.lower())
-            article_unique_words.update(words)
-
-        all_words_for_cloud.extend(list(article_unique_words))
-
-        # Extract affiliations and countries
-        if 'affiliation' in entry:
-            affiliations = entry['affiliation']
-            if isinstance(affiliations, list):
-                for aff in affiliations:
-                    if isinstance(aff, dict):
-                        if 'affilname' in aff:
-                            orgs.append(aff['affilname'])
-                        if 'affiliation-country' in aff:
-                            countries.append(aff['affiliation-country'])
-            elif isinstance(affiliations, dict):
-                if 'affilname' in affiliations:
-                    orgs.append(affiliations['affilname'])
-                if 'affiliation-country' in affiliations:
-                    countries.append(affiliations['affiliation-country'])
-
-        # Extract year
-        if 'prism:coverDate' in entry:
-            year_str = entry['prism:coverDate']
-            if year_str and isinstance(year_str, str): # Check if string and not empty
-                year = year_str.split('-')[0]
-                try: # Add try-except for robustness
-                    years.append(int(year))
-                except ValueError:
-                    pass # Ignore if year is not a valid integer
-
-        # Extract authors
-        # Prioritize the 'author' list/dict if available
-        author_found = False
-        if 'author' in entry:
-            entry_authors = entry['author']
-            if isinstance(entry_authors, list):
-                for author in entry_authors:
-                    # Check if author is a dict and has 'authname'
-                    if isinstance(author, dict) and 'authname' in author:
-                        authors.append(author['authname'])
-                        author_found = True # Mark as found
-            elif isinstance(entry_authors, dict) and 'authname' in entry_authors: # Handle single author case
-                authors.append(entry_authors['authname'])
-                author_found = True # Mark as found
-        
-        # If no author found in 'author' list/dict, check 'dc:creator'
-        if not author_found and 'dc:creator' in entry:
-            creator_name = entry['dc:creator']
-            if creator_name and isinstance(creator_name, str):
-                authors.append(creator_name)
-
-    return all_words_for_cloud, orgs, countries, years, authors
\ No newline at end of file
+    # Key the cache on the entry identifiers, hashing the full list of dicts would cost more than parsing it
+    return _parse_results_cached(entries_cache_key(entries), entries)
+
+@st.cache_data(show_spinner=False, max_entries=32)
+def _parse_results_cached(entries_key, _entries):
+    return _parse_results_impl(_entries)
+
+def _parse_results_impl(entries):
+    # Extract the fields once and derive everything with column-wise pandas operations
+    df = pd.DataFrame(to_soa(entries))
+
+    # Extract and process keywords, title and description words (unique per article)
+    keywords = df['keywords'].str.lower().str.split(' | ', regex=False).explode().str.strip()
+    text = df['title'].fillna('') + ' ' + df['description'].fillna('')
+    text_words = text.str.lower().map(tokenize_words).explode()
+    words = pd.concat([keywords, text_words])
+    # Normalized once here for the word clouds like WordCloud.generate would: no stopwords, no single characters, no numbers
+    from wordcloud import STOPWORDS
+    words = words.dropna() # Entries without keywords or text leave NaN after explode
+    words = words[(words.str.len() > 1) & ~words.isin(STOPWORDS) & ~words.str.isnumeric()]
+    article_words = pd.DataFrame({'article': words.index, 'word': words.to_numpy()}).drop_duplicates()
+    all_words_for_cloud = article_words['word'].reset_index(drop=True)
+
+    # Extract affiliations and countries
+    affiliations = df['affiliations'].map(as_list).explode()
+    orgs = _as_category(affiliations.str.get('affilname').dropna())
+    countries = _as_category(affiliations.str.get('affiliation-country').dropna())
+
+    # Extract year
+    cover_year = df['cover_date'].str.slice(0, 4)
+    years = pd.to_numeric(cover_year, errors='coerce').dropna().astype(int).reset_index(drop=True)
+
+    # Extract authors
+    # Prioritize the 'author' list/dict if available, fall back to 'dc:creator' for entries without one
+    author_names = df['authors'].map(as_list).explode().str.get('authname').dropna()
+    creators = df['creator']
+    creators = creators[(creators.str.len() > 0) & ~creators.index.isin(author_names.index)]
+    authors = _as_category(pd.concat([author_names, creators]).sort_index(kind='stable'))
+
+    return ParsedResults(all_words_for_cloud, orgs, countries, years, authors)
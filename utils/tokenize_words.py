@@ -0,0 +1,14 @@
+import re
+
+# A maximal run of \w characters is always bounded by \b, so the boundary assertions of r'\b\w+\b' are redundant work
+_WORD_RE = re.compile(r'\w+')
+
+# bytes.translate table keeping ASCII word characters (regex \w) and mapping every other byte to a space
+_ASCII_WORD_BYTES = bytes(code if chr(code).isalnum() or code == ord('_') else ord(' ') for code in range(128)) + b' ' * 128
+
+def tokenize_words(text):
+    """Split text into words, same result as re.findall(r'\\b\\w+\\b', text)"""
+    if text.isascii():
+        # ASCII text goes through a single 256-byte table lookup per character, several times faster than the regex engine
+        return text.encode('ascii').translate(_ASCII_WORD_BYTES).decode('ascii').split()
+    return _WORD_RE.findall(text)